@@ -1,11 +1,13 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import timedelta
 import re
-from io import StringIO
-import base64
+from html import escape
+from collections import defaultdict
+from io import BytesIO
 
 # Configure page
 st.set_page_config(
@@ -15,40 +17,108 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Column dtypes declared up front so read_csv skips type inference
+CSV_DTYPES = {
+    'Name': 'string',
+    'Type': 'category',
+    'URL': 'string',
+    'Last Edited By': 'string',
+    'Last Editor Email': 'string',
+    'Folder Path': 'string[pyarrow]'
+}
+
+# Rows parsed per read_csv chunk when loading an inventory
+CSV_CHUNK_ROWS = 200_000
+
+# Above this many rows the data table skips Styler color coding
+STYLED_TABLE_MAX_ROWS = 2000
+
+# Files listed per folder in the tree view before the rest are summarized
+TREE_MAX_FILES_PER_FOLDER = 50
+
+# Session state key of the folder tree's archive multiselect
+TREE_ARCHIVE_KEY = 'tree_archive_selection'
+
+# Copy/version suffixes and office extensions stripped before comparing names
+_SUFFIX_RE = re.compile(
+    r'(?:_copy|_v\d+|\(\d+\)|_final|_draft|\.(?:pdf|docx?|xlsx?|pptx?)$)',
+    re.IGNORECASE
+)
+
 # Initialize session state
 if 'marked_for_archiving' not in st.session_state:
     st.session_state.marked_for_archiving = set()
 
-def load_data(uploaded_file):
-    """Load and process the CSV data"""
-    if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file)
-        
-        # Clean and process data
-        df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
-        df['Days Since Update'] = (datetime.now() - df['Last Updated']).dt.days
-        
-        # Create age categories
-        def categorize_age(days):
-            if pd.isna(days):
-                return "Unknown"
-            elif days <= 30:
-                return "Recent (0-30 days)"
-            elif days <= 90:
-                return "Moderately Old (1-3 months)"
-            elif days <= 365:
-                return "Old (3-12 months)"
-            else:
-                return "Very Old (1+ years)"
-        
-        df['Age Category'] = df['Days Since Update'].apply(categorize_age)
-        
-        # Create folder hierarchy levels
-        df['Folder Level'] = df['Folder Path'].str.count('/')
-        df['Parent Folder'] = df['Folder Path'].str.extract(r'(.+)/[^/]+$').fillna('Root')
-        
-        return df
-    return None
+def _process_chunk(df, now64):
+    """Derive the age and folder hierarchy columns for one chunk of rows"""
+    # Clean and process data
+    df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
+    # Not declared in CSV_DTYPES: exports can hold values like "3.5" or
+    # "12 items", which would make read_csv raise. Left as the numeric dtype
+    # pandas picks, since an Int32 cast would raise on fractional counts.
+    df['Content Count'] = pd.to_numeric(df['Content Count'], errors='coerce')
+    # Subtract on the raw datetime64 buffer; NaT yields NaN, kept as <NA>
+    days = np.floor((now64 - df['Last Updated'].values) / np.timedelta64(1, 'D'))
+    df['Days Since Update'] = pd.Series(days, index=df.index).astype('Int32')
+    
+    # Create age categories (bucketed in one pass; NaT dates become "Unknown")
+    bins = [-np.inf, 30, 90, 365, np.inf]
+    labels = [
+        "Recent (0-30 days)",
+        "Moderately Old (1-3 months)",
+        "Old (3-12 months)",
+        "Very Old (1+ years)"
+    ]
+    cats = pd.cut(df['Days Since Update'], bins=bins, labels=labels)
+    df['Age Category'] = cats.cat.add_categories(["Unknown"]).fillna("Unknown")
+    
+    # Create folder hierarchy levels (Folder Path is read Arrow-backed, which
+    # keeps the count/split in compiled kernels)
+    df['Folder Level'] = df['Folder Path'].str.count('/').astype('Int16')
+    # Parent is everything before the last '/', when both sides are non-empty
+    path_split = df['Folder Path'].str.rsplit('/', n=1)
+    head, tail = path_split.str[0], path_split.str[1]
+    parent = head.where((head.str.len() > 0) & (tail.str.len() > 0))
+    df['Parent Folder'] = parent.fillna('Root')
+    
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl=timedelta(days=1))
+def load_data(raw_bytes: bytes):
+    """Load and process the CSV data
+
+    Cached on the uploaded file's bytes, so widget reruns skip the parse.
+    Entries expire after a day so Days Since Update and Age Category do not
+    go stale, and only a few uploads are kept in memory at once.
+    The returned frame is a cached copy; callers that mutate a slice of it
+    (e.g. filtered_df) should take an explicit .copy() first.
+    """
+    now64 = pd.Timestamp.now().to_datetime64()
+    
+    # Read with declared dtypes so large exports skip type inference, and
+    # derive the computed columns chunk by chunk before concatenating
+    with pd.read_csv(
+        BytesIO(raw_bytes),
+        dtype=CSV_DTYPES,
+        parse_dates=['Last Updated'],
+        chunksize=CSV_CHUNK_ROWS
+    ) as reader:
+        chunks = [_process_chunk(chunk, now64) for chunk in reader]
+    
+    if not chunks:
+        return None
+    df = pd.concat(chunks, ignore_index=True)
+    
+    # Low-cardinality labels as categoricals: filters compare integer codes
+    # (re-applied after concat, which drops mismatched categories)
+    for col in ('Type', 'Age Category', 'Parent Folder'):
+        df[col] = df[col].astype('category')
+    
+    # Reference time of this load; part of the view fingerprint so caches
+    # downstream refresh together with this one's daily ttl
+    df.attrs['loaded_at'] = now64
+    
+    return df
 
 def get_color_for_age(age_category):
     """Return color based on file age"""
@@ -96,29 +166,23 @@ def ai_archive_suggestions(df):
         })
     
     # Rule 3: Duplicate or similar file names
-    file_df = df[df['Type'] == 'File'].copy()
+    file_df = df[df['Type'] == 'File']
     if len(file_df) > 0:
-        # Simple duplicate detection based on similar names
-        duplicate_candidates = []
-        seen_patterns = {}
-        
-        for idx, row in file_df.iterrows():
-            # Remove common suffixes and create pattern
-            name_clean = re.sub(r'(_copy|_v\d+|\(\d+\)|_final|_draft)', '', row['Name'].lower())
-            name_pattern = re.sub(r'\.(pdf|docx?|xlsx?|pptx?)$', '', name_clean)
-            
-            if name_pattern in seen_patterns:
-                duplicate_candidates.extend([seen_patterns[name_pattern], row['Name']])
-            else:
-                seen_patterns[name_pattern] = row['Name']
+        # Simple duplicate detection based on similar names:
+        # remove common suffixes and extensions, then flag every collision
+        names = file_df['Name'].str.lower().str.replace(_SUFFIX_RE, '', regex=True)
+        dup_mask = names.duplicated(keep=False) & names.notna()
+        # Keep each group of similar names together so the sample shows pairs
+        group_order = names[dup_mask].argsort(kind='stable')
+        duplicate_candidates = file_df.loc[dup_mask, 'Name'].iloc[group_order].unique().tolist()
         
         if duplicate_candidates:
             suggestions.append({
                 'category': 'Potential Duplicates',
-                'count': len(set(duplicate_candidates)),
+                'count': len(duplicate_candidates),
                 'reason': 'Files with similar names that might be duplicates',
                 'confidence': 'Medium',
-                'items': list(set(duplicate_candidates))[:10]
+                'items': duplicate_candidates[:10]
             })
     
     # Rule 4: Large folders with old content
@@ -139,125 +203,173 @@ def ai_archive_suggestions(df):
     
     return suggestions
 
-def create_folder_tree_view(df):
-    """Create collapsible folder tree view"""
-    if df is None or len(df) == 0:
-        return
-    
-    # Group by folder path
-    folders = df[df['Type'] == 'Folder'].copy()
-    files = df[df['Type'] == 'File'].copy()
-    
-    # Create folder hierarchy
-    folder_structure = {}
-    
-    # Build folder structure
-    for _, folder in folders.iterrows():
-        path_parts = folder['Folder Path'].split('/')
-        current_dict = folder_structure
-        
-        for part in path_parts:
-            if part not in current_dict:
-                current_dict[part] = {'folders': {}, 'files': [], 'info': None}
-            current_dict = current_dict[part]['folders']
-        
-        # Store folder info at the final level
-        path_parts = folder['Folder Path'].split('/')
-        current_dict = folder_structure
-        for part in path_parts[:-1]:
-            current_dict = current_dict[part]['folders']
-        current_dict[path_parts[-1]]['info'] = folder
-    
-    # Add files to their respective folders
-    for _, file in files.iterrows():
-        path_parts = file['Folder Path'].split('/')
-        current_dict = folder_structure
-        
-        for part in path_parts:
-            if part not in current_dict:
-                current_dict[part] = {'folders': {}, 'files': [], 'info': None}
-            current_dict = current_dict[part]['folders']
+def filter_fingerprint(df, *filters):
+    """Return a cheap, hashable key identifying a filtered view of the data"""
+    last_updated = df['Last Updated'].max()
+    return (len(df), None if pd.isna(last_updated) else last_updated.value, filters)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_archive_suggestions(df_key, _df):
+    """Return ai_archive_suggestions for _df, cached on df_key
+
+    The leading underscore keeps Streamlit from hashing the whole frame;
+    df_key must change whenever the filtered data does.
+    """
+    return ai_archive_suggestions(_df)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def overview_aggregates(df_key, _df):
+    """Return the small frames behind the overview charts, cached on df_key
+
+    Returns (age_counts, type_counts, timeline_data); timeline_data is None
+    when no row has a valid Last Updated date. Categories with no rows are
+    dropped so the charts only show values present in the view.
+    """
+    age_counts = _df['Age Category'].value_counts()
+    type_counts = _df['Type'].value_counts()
+    
+    timeline_data = None
+    if not _df['Last Updated'].isna().all():
+        timeline_data = _df.groupby(
+            [pd.Grouper(key='Last Updated', freq='MS'), 'Type'],
+            observed=True
+        ).size().reset_index(name='count')
+    
+    return age_counts[age_counts > 0], type_counts[type_counts > 0], timeline_data
+
+def _new_tree_node():
+    """Return an empty folder tree node"""
+    return {'folders': defaultdict(_new_tree_node), 'files': [], 'info': None}
+
+def build_folder_tree(df):
+    """Build the nested folder dict for df
+
+    Only called from the cached render_folder_tree, so the tree itself is
+    not kept once the HTML has been built.
+    """
+    # Build folder hierarchy in a single pass: descend each row's path once,
+    # creating missing nodes, then attach the row as folder info or a file
+    folder_structure = defaultdict(_new_tree_node)
+    # Only the columns the display reads are carried into the tree, as
+    # (name, age category) tuples. Paths are split here rather than stored in
+    # the cached frame, which would be unpickled on every rerun.
+    path_parts_col = df['Folder Path'].str.split('/')
+    rows = df[['Type', 'Name', 'Age Category']].itertuples(index=False, name=None)
+    
+    for path_parts, (item_type, name, age_category) in zip(path_parts_col, rows):
+        if not isinstance(path_parts, list):
+            continue
         
-        # Add file to the folder
-        path_parts = file['Folder Path'].split('/')
         current_dict = folder_structure
         for part in path_parts:
-            current_dict = current_dict[part]['folders']
-        
-        # Go back one level to add to files list
-        path_parts = file['Folder Path'].split('/')
-        current_dict = folder_structure
-        for part in path_parts[:-1]:
-            current_dict = current_dict[part]['folders']
-        if path_parts:
-            current_dict[path_parts[-1]]['files'].append(file)
-    
-    # Display folder tree
-    def display_folder(name, content, level=0):
-        indent = "　" * level  # Japanese space for better indentation
+            node = current_dict[part]
+            current_dict = node['folders']
         
+        if item_type == 'Folder':
+            node['info'] = (name, age_category)
+        elif item_type == 'File':
+            node['files'].append((name, age_category))
+    
+    return folder_structure
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def render_folder_tree(df_key, _df):
+    """Return (html, item_names) for the folder tree of _df, cached on df_key
+
+    Each folder lists at most TREE_MAX_FILES_PER_FOLDER files so the markdown
+    payload stays bounded for large inventories.
+    """
+    folder_structure = build_folder_tree(_df)
+    
+    # Render the tree as one HTML blob; native <details> elements
+    # handle expand/collapse without a widget per folder
+    html_parts = []
+    item_names = set()
+    
+    def display_folder(name, content):
         # Folder header
         folder_info = content.get('info')
         if folder_info is not None:
-            age_color = get_color_for_age(folder_info['Age Category'])
+            folder_name, folder_age = folder_info
+            age_color = get_color_for_age(folder_age)
             file_count = len(content['files'])
             subfolder_count = len([k for k, v in content['folders'].items() if v['info'] is not None])
+            item_names.add(folder_name)
             
-            col1, col2, col3 = st.columns([1, 8, 1])
-            
-            with col1:
-                expanded = st.checkbox("", key=f"folder_{name}_{level}", value=False)
+            html_parts.append(
+                f"<details><summary style='background-color: {age_color}20; padding: 8px; "
+                f"border-left: 4px solid {age_color}; margin: 2px 0; cursor: pointer;'>"
+                f"📁 <strong>{escape(str(name))}</strong> "
+                f"<small>({file_count} files, {subfolder_count} subfolders)</small></summary>"
+                f"<div style='margin-left: 20px;'>"
+            )
             
-            with col2:
-                st.markdown(f"""
-                <div style='background-color: {age_color}20; padding: 8px; border-left: 4px solid {age_color}; margin: 2px 0;'>
-                    {indent}📁 <strong>{name}</strong> 
-                    <small>({file_count} files, {subfolder_count} subfolders)</small>
-                </div>
-                """, unsafe_allow_html=True)
+            # Show files in this folder
+            for file_name, file_age in content['files'][:TREE_MAX_FILES_PER_FOLDER]:
+                age_color = get_color_for_age(file_age)
+                item_names.add(file_name)
+                html_parts.append(
+                    f"<div style='background-color: {age_color}10; padding: 4px; "
+                    f"border-left: 2px solid {age_color}; margin: 1px 0;'>"
+                    f"📄 {escape(str(file_name))} "
+                    f"<small>({file_age})</small></div>"
+                )
+            if file_count > TREE_MAX_FILES_PER_FOLDER:
+                html_parts.append(
+                    f"<div style='margin: 1px 0;'><small><em>... and "
+                    f"{file_count - TREE_MAX_FILES_PER_FOLDER} more files "
+                    f"(see the Data Table tab)</em></small></div>"
+                )
             
-            with col3:
-                archive_key = f"archive_folder_{folder_info['Name']}_{level}"
-                if st.checkbox("Archive", key=archive_key):
-                    st.session_state.marked_for_archiving.add(folder_info['Name'])
-                elif archive_key in st.session_state and not st.session_state[archive_key]:
-                    st.session_state.marked_for_archiving.discard(folder_info['Name'])
+            # Show subfolders
+            for subfolder_name, subfolder_content in content['folders'].items():
+                if subfolder_content['info'] is not None:
+                    display_folder(subfolder_name, subfolder_content)
             
-            if expanded:
-                # Show files in this folder
-                for file_info in content['files']:
-                    age_color = get_color_for_age(file_info['Age Category'])
-                    col1, col2, col3 = st.columns([1, 8, 1])
-                    
-                    with col2:
-                        st.markdown(f"""
-                        <div style='background-color: {age_color}10; padding: 4px; border-left: 2px solid {age_color}; margin: 1px 0; margin-left: 20px;'>
-                            {indent}　📄 {file_info['Name']} 
-                            <small>({file_info['Age Category']})</small>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        archive_key = f"archive_file_{file_info['Name']}_{level}"
-                        if st.checkbox("", key=archive_key):
-                            st.session_state.marked_for_archiving.add(file_info['Name'])
-                
-                # Show subfolders
-                for subfolder_name, subfolder_content in content['folders'].items():
-                    if subfolder_content['info'] is not None:
-                        display_folder(subfolder_name, subfolder_content, level + 1)
+            html_parts.append("</div></details>")
     
     # Display root level folders
     for folder_name, folder_content in folder_structure.items():
         if folder_content['info'] is not None:
             display_folder(folder_name, folder_content)
+    
+    return '\n'.join(html_parts), sorted(str(n) for n in item_names if not pd.isna(n))
 
-def create_download_link(df, filename):
-    """Create download link for filtered data"""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">📥 Download Filtered Data as CSV</a>'
-    return href
+def _sync_archive_selection(options):
+    """Apply the tree multiselect to marked_for_archiving
+
+    Marks on items outside options (the current view) are left untouched.
+    """
+    marked = st.session_state.marked_for_archiving
+    marked.difference_update(options)
+    marked.update(st.session_state[TREE_ARCHIVE_KEY])
+
+def create_folder_tree_view(df, df_key):
+    """Create collapsible folder tree view"""
+    if df is None or len(df) == 0:
+        return
+    
+    tree_html, options = render_folder_tree(df_key, df)
+    st.markdown(tree_html, unsafe_allow_html=True)
+    
+    # One multiselect replaces the per-item Archive checkboxes. Its value is
+    # seeded from marked_for_archiving before it is created (marks can also
+    # come from the suggestions tab) and written back in the callback, so the
+    # widget keeps a stable identity across reruns.
+    marked = st.session_state.marked_for_archiving
+    st.session_state[TREE_ARCHIVE_KEY] = [n for n in options if n in marked]
+    st.multiselect(
+        "🗂️ Mark for archiving:",
+        options=options,
+        key=TREE_ARCHIVE_KEY,
+        on_change=_sync_archive_selection,
+        args=(options,)
+    )
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def csv_bytes(df_key, _df):
+    """Return _df encoded as CSV bytes, cached on df_key"""
+    return _df.to_csv(index=False).encode()
 
 # Main App
 def main():
@@ -288,7 +400,7 @@ def main():
         return
     
     # Load data
-    df = load_data(uploaded_file)
+    df = load_data(uploaded_file.getvalue())
     if df is None:
         st.error("Could not load the CSV file. Please check the format.")
         return
@@ -323,46 +435,62 @@ def main():
         date_range = None
     
     # Age category filter
+    # Plain lists: older Streamlit versions cannot compare defaults against a Categorical
+    age_options = df['Age Category'].unique().tolist()
     age_categories = st.sidebar.multiselect(
         "📊 Age Categories:",
-        options=df['Age Category'].unique(),
-        default=df['Age Category'].unique()
+        options=age_options,
+        default=age_options
     )
     
-    # Apply filters
-    filtered_df = df.copy()
+    # Apply filters: build one combined mask and slice once
+    mask = np.ones(len(df), dtype=bool)
     
     if type_filter == "Files Only":
-        filtered_df = filtered_df[filtered_df['Type'] == 'File']
+        mask &= (df['Type'].values == 'File')
     elif type_filter == "Folders Only":
-        filtered_df = filtered_df[filtered_df['Type'] == 'Folder']
+        mask &= (df['Type'].values == 'Folder')
     
     if search_term:
-        filtered_df = filtered_df[
-            filtered_df['Name'].str.contains(search_term, case=False, na=False)
-        ]
+        mask &= df['Name'].str.contains(search_term, case=False, na=False, regex=False).to_numpy(dtype=bool)
     
     if date_range and len(date_range) == 2:
-        filtered_df = filtered_df[
-            (filtered_df['Last Updated'].dt.date >= date_range[0]) &
-            (filtered_df['Last Updated'].dt.date <= date_range[1])
-        ]
+        updated_days = df['Last Updated'].values.astype('datetime64[D]')
+        mask &= (
+            (updated_days >= np.datetime64(date_range[0])) &
+            (updated_days <= np.datetime64(date_range[1]))
+        )
     
-    filtered_df = filtered_df[filtered_df['Age Category'].isin(age_categories)]
+    mask &= df['Age Category'].isin(age_categories).values
+    
+    filtered_df = df[mask]
+    
+    # Fingerprint of the current view, used to key cached computations
+    filter_key = filter_fingerprint(
+        filtered_df,
+        uploaded_file.file_id,
+        df.attrs.get('loaded_at'),
+        type_filter,
+        search_term,
+        tuple(date_range) if date_range else None,
+        tuple(sorted(age_categories))
+    )
     
     # Main content tabs
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🗂️ Folder Tree", "🤖 AI Suggestions", "📋 Data Table"])
     
     with tab1:
+        age_counts, type_counts, timeline_data = overview_aggregates(filter_key, filtered_df)
+        
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric("Total Items", len(filtered_df))
         with col2:
-            st.metric("Files", len(filtered_df[filtered_df['Type'] == 'File']))
+            st.metric("Files", int(type_counts.get('File', 0)))
         with col3:
-            st.metric("Folders", len(filtered_df[filtered_df['Type'] == 'Folder']))
+            st.metric("Folders", int(type_counts.get('Folder', 0)))
         with col4:
             st.metric("Marked for Archiving", len(st.session_state.marked_for_archiving))
         
@@ -371,7 +499,6 @@ def main():
         
         with col1:
             # Age distribution pie chart
-            age_counts = filtered_df['Age Category'].value_counts()
             fig_pie = px.pie(
                 values=age_counts.values,
                 names=age_counts.index,
@@ -388,7 +515,6 @@ def main():
         
         with col2:
             # File type distribution
-            type_counts = filtered_df['Type'].value_counts()
             fig_bar = px.bar(
                 x=type_counts.index,
                 y=type_counts.values,
@@ -399,13 +525,7 @@ def main():
             st.plotly_chart(fig_bar, use_container_width=True)
         
         # Timeline chart
-        if not filtered_df['Last Updated'].isna().all():
-            timeline_data = filtered_df.groupby([
-                filtered_df['Last Updated'].dt.to_period('M'),
-                'Type'
-            ]).size().reset_index(name='count')
-            timeline_data['Last Updated'] = timeline_data['Last Updated'].astype(str)
-            
+        if timeline_data is not None:
             fig_timeline = px.line(
                 timeline_data,
                 x='Last Updated',
@@ -419,10 +539,10 @@ def main():
     
     with tab2:
         st.header("🗂️ Collapsible Folder Tree")
-        st.markdown("*Click checkboxes to expand folders and mark items for archiving*")
+        st.markdown("*Click a folder to expand it, then pick items below to mark them for archiving*")
         
         if len(filtered_df) > 0:
-            create_folder_tree_view(filtered_df)
+            create_folder_tree_view(filtered_df, filter_key)
         else:
             st.info("No items match your current filters.")
     
@@ -430,7 +550,7 @@ def main():
         st.header("🤖 AI Archive Suggestions")
         st.markdown("*Based on file age, usage patterns, and content analysis*")
         
-        suggestions = ai_archive_suggestions(filtered_df)
+        suggestions = cached_archive_suggestions(filter_key, filtered_df)
         
         if suggestions:
             for suggestion in suggestions:
@@ -465,17 +585,32 @@ def main():
         st.header("📋 Filtered Data Table")
         
         if len(filtered_df) > 0:
-            # Add color coding to the dataframe display
-            def highlight_age(row):
-                color = get_color_for_age(row['Age Category'])
-                return [f'background-color: {color}20' if col == 'Age Category' else '' for col in row.index]
+            column_config = {
+                "URL": st.column_config.LinkColumn("URL"),
+                "Last Updated": st.column_config.DatetimeColumn("Last Updated", format="YYYY-MM-DD HH:mm"),
+                "Days Since Update": st.column_config.NumberColumn("Days Since Update", format="%d")
+            }
             
-            # Display data with color coding
-            styled_df = filtered_df.style.apply(highlight_age, axis=1)
-            st.dataframe(styled_df, use_container_width=True)
+            if len(filtered_df) <= STYLED_TABLE_MAX_ROWS:
+                # Add color coding to the dataframe display (one call over the
+                # Age Category column instead of a Series per row)
+                def highlight_age(ages):
+                    return [f'background-color: {get_color_for_age(age)}20' for age in ages]
+                
+                # Display data with color coding
+                styled_df = filtered_df.style.apply(highlight_age, subset=['Age Category'])
+                st.dataframe(styled_df, use_container_width=True, column_config=column_config)
+            else:
+                # Styler renders per row in Python; large tables go straight to the client
+                st.dataframe(filtered_df, use_container_width=True, column_config=column_config)
             
             # Download button
-            st.markdown(create_download_link(filtered_df, "filtered_drive_inventory.csv"), unsafe_allow_html=True)
+            st.download_button(
+                "📥 Download Filtered Data as CSV",
+                data=csv_bytes(filter_key, filtered_df),
+                file_name="filtered_drive_inventory.csv",
+                mime="text/csv"
+            )
             
         else:
             st.info("No items match your current filters.")